@@ -7,22 +7,30 @@ Python + Pygame
   プレイヤー2 (右): 上/下 矢印キー
   一時停止: スペースキー
   リスタート: Rキー
+  入力遅延表示: F3キー
+  フルスクリーン切替: F11キー
 """
 
 import pygame
 import sys
 import random
 import math
-from typing import List, Tuple
+import struct
+import time
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
 
 # 初期化
 pygame.init()
 pygame.mixer.init()
 
-# 画面設定
+# 画面設定（内部レンダーターゲットの解像度。レイアウトはすべてこのサイズが基準）
 SCREEN_WIDTH = 900
 SCREEN_HEIGHT = 600
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+EFFECTS_SCALE = 1.0          # 背景・パーティクル層の解像度倍率（0.5 で半分の解像度）
+WINDOW_SIZE = (SCREEN_WIDTH, SCREEN_HEIGHT)
+FULLSCREEN = False
+INTEGER_SCALING = True       # ウィンドウへは整数倍で拡大（余白が大きくなる場合は画面に合わせて拡大縮小）
+INTEGER_SCALING_MIN_COVERAGE = 0.75  # 等倍表示を使う最低の面積比（画面に合わせた場合との比較）
 pygame.display.set_caption("NEON TENNIS")
 
 # モダンカラーパレット
@@ -77,6 +85,139 @@ BALL_SIZE = 14
 BALL_SPEED_INITIAL = 8
 BALL_SPEED_MAX = 18
 
+# アニメーション設定
+POPUP_LIFE = 60
+PULSE_STEPS = 64
+TITLE_GLOW_STEPS = 24        # タイトルの脈動は遅いので少ないステップで十分
+
+# 入力設定
+LATE_INPUT_SAMPLING = True   # 表示直前まで待ってから入力をサンプリングする
+INPUT_POLL_INTERVAL = 0.001  # 待機中にイベントをポーリングする間隔（秒）
+INPUT_SAMPLE_MARGIN = 0.002  # 遅延サンプリング時に描画時間へ上乗せする余裕（秒）
+LATENCY_REPORT = False       # 終了時に入力遅延のヒストグラムを出力する（F3 表示中も出力）
+
+# スナップショット設定（リトルエンディアン固定レイアウト）
+SNAPSHOT_MAGIC = b"NTSS"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_EFFECTS = 0x01
+GAME_STATES = ("menu", "playing", "game_over")
+
+SNAPSHOT_HEADER = struct.Struct("<4sBB")                 # magic, version, flags
+SNAPSHOT_STATE = struct.Struct(
+    "<BBBBIIdd"        # state, paused, game_over, winner, rally_count, max_rally, menu_pulse, grid_offset
+    "dddddd3B"         # ball: x, y, dx, dy, speed, pulse, color
+    "iiHHd"            # player1: x, y, score, hit_flash, move_remainder
+    "iiHHd"            # player2
+    "ddd")             # screen shake: trauma, offset_x, offset_y
+SNAPSHOT_RNG = struct.Struct("<625IBd")                 # random の内部状態, gauss_next の有無, gauss_next
+SNAPSHOT_COUNTS = struct.Struct("<III")                 # trails, particles, popups
+SNAPSHOT_TRAIL = struct.Struct("<ddHH3B")               # x, y, life, initial_life, color
+SNAPSHOT_PARTICLE = struct.Struct("<ddddd3BHH")         # x, y, dx, dy, size, color, life, initial_life
+SNAPSHOT_POPUP = struct.Struct("<dd3BHHB")              # x, y, color, life, initial_life, text の長さ（後ろに UTF-8 テキスト）
+
+
+def surface_scale(surface: pygame.Surface) -> float:
+    """描画先サーフェスの論理解像度に対する倍率"""
+    return surface.get_width() / SCREEN_WIDTH
+
+
+class Renderer:
+    """内部レンダーターゲットに描画し、ウィンドウへ一度の拡大転送で表示する
+
+    ターゲットは常に論理解像度（SCREEN_WIDTH x SCREEN_HEIGHT）。
+    解像度を下げられるのはエフェクト層（effects_scale）のみ。
+    offscreen ではウィンドウに触れず、専用のサーフェスにだけ描画する。
+    """
+    def __init__(self, effects_scale: float = EFFECTS_SCALE, window_size: Tuple[int, int] = WINDOW_SIZE,
+                 fullscreen: bool = FULLSCREEN, integer_scaling: bool = INTEGER_SCALING,
+                 offscreen: bool = False):
+        self.size = (SCREEN_WIDTH, SCREEN_HEIGHT)
+        self.effects_scale = effects_scale
+        self.window_size = window_size
+        self.fullscreen = fullscreen
+        self.integer_scaling = integer_scaling
+        self.offscreen = offscreen
+        self.set_mode()
+
+    def set_mode(self):
+        if self.offscreen:
+            pass  # ディスプレイには触れない
+        elif self.fullscreen:
+            pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            pygame.display.set_mode(self.window_size, pygame.RESIZABLE)
+        self.resize()
+
+    def toggle_fullscreen(self):
+        if self.offscreen:
+            return
+        self.fullscreen = not self.fullscreen
+        self.set_mode()
+
+    def resize(self, window_size: Optional[Tuple[int, int]] = None):
+        """ウィンドウサイズから表示領域を決め、ターゲットを作り直す
+
+        window_size はユーザーによるリサイズ後のサイズ。フルスクリーンから戻るときに使う。
+        """
+        if self.offscreen:
+            self.window = None
+            self.viewport = pygame.Rect((0, 0), self.size)
+            self.integer_view = True
+            self.direct = False
+            self.target = pygame.Surface(self.size, 0, 32)
+            self._create_effects()
+            return
+
+        if window_size is not None and not self.fullscreen:
+            self.window_size = window_size
+        self.window = pygame.display.get_surface()
+        window_w, window_h = self.window.get_size()
+        width, height = self.size
+
+        # 2倍以上か、画面に合わせた場合と比べて十分な面積を覆うときだけ整数倍にする
+        ratio = min(window_w / width, window_h / height)
+        factor = min(window_w // width, window_h // height) if self.integer_scaling else 0
+        self.integer_view = factor >= 2 or (factor == 1 and (1 / ratio) ** 2 >= INTEGER_SCALING_MIN_COVERAGE)
+        if self.integer_view:
+            view_size = (width * factor, height * factor)
+        else:
+            view_size = (max(1, int(width * ratio)), max(1, int(height * ratio)))
+        self.viewport = pygame.Rect(((window_w - view_size[0]) // 2, (window_h - view_size[1]) // 2),
+                                    view_size)
+        self.window.fill(Colors.BG_DARK)
+
+        # 等倍表示ならウィンドウへ直接描画し、表示時の転送を省く
+        self.direct = view_size == self.size
+        if self.direct:
+            self.target = self.window.subsurface(self.viewport)
+        else:
+            self.target = pygame.Surface(self.size).convert()
+        self._create_effects()
+
+    def _create_effects(self):
+        width, height = self.size
+        effects_size = (max(1, int(width * self.effects_scale)), max(1, int(height * self.effects_scale)))
+        if effects_size == self.size:
+            self.effects = self.target
+        else:
+            self.effects = pygame.Surface(effects_size, 0, self.target)
+
+    def compose_effects(self):
+        """エフェクト層をターゲットへ拡大転送"""
+        if self.effects is not self.target:
+            pygame.transform.scale(self.effects, self.size, self.target)
+
+    def present(self):
+        if self.offscreen:
+            return
+        if not self.direct:
+            dest = self.window.subsurface(self.viewport)
+            if self.integer_view:
+                pygame.transform.scale(self.target, self.viewport.size, dest)
+            else:
+                pygame.transform.smoothscale(self.target, self.viewport.size, dest)
+        pygame.display.flip()
+
 
 def create_glow_surface(size: int, color: Tuple[int, int, int], intensity: float = 1.0) -> pygame.Surface:
     """グロー効果のサーフェスを作成"""
@@ -102,6 +243,81 @@ def draw_gradient_rect(surface: pygame.Surface, rect: pygame.Rect,
             pygame.draw.line(surface, color, (rect.x + i, rect.y), (rect.x + i, rect.y + rect.height))
 
 
+class AnimationClip:
+    """事前に描画したフレーム列をインデックスで再生するアニメーションクリップ
+
+    同じキーのクリップは初回使用時に一度だけ生成され、全インスタンスで共有される。
+    """
+    _cache: Dict[Hashable, "AnimationClip"] = {}
+
+    def __init__(self, frames: List[pygame.Surface]):
+        self.frames = frames
+
+    def __len__(self) -> int:
+        return len(self.frames)
+
+    @classmethod
+    def get(cls, key: Hashable, build: Callable[[], List[pygame.Surface]]) -> "AnimationClip":
+        clip = cls._cache.get(key)
+        if clip is None:
+            clip = cls(build())
+            cls._cache[key] = clip
+        return clip
+
+    def frame(self, index: int) -> pygame.Surface:
+        """指定インデックスのフレーム（範囲外は端のフレーム）"""
+        return self.frames[max(0, min(index, len(self.frames) - 1))]
+
+    def frame_at_phase(self, phase: float) -> pygame.Surface:
+        """周期 2π の位相に対応するフレーム（ループ再生用）"""
+        index = int(phase / (math.pi * 2) * len(self.frames)) % len(self.frames)
+        return self.frames[index]
+
+
+def build_popup_frames(text: str, color: Tuple[int, int, int], life: int) -> List[pygame.Surface]:
+    """拡大しながらフェードアウトするポップアップのフレーム列を生成"""
+    text_surf = font_medium.render(text, True, color)
+    frames = []
+    for remaining in range(life, 0, -1):
+        ratio = remaining / life
+        scale = 1 + (1 - ratio) * 0.5
+        scaled_size = (int(text_surf.get_width() * scale), int(text_surf.get_height() * scale))
+        frame = pygame.transform.scale(text_surf, scaled_size)
+        frame.set_alpha(int(255 * ratio))
+        frames.append(frame)
+    return frames
+
+
+def build_pulse_frames(font: pygame.font.Font, text: str, color: Tuple[int, int, int],
+                       steps: int = PULSE_STEPS) -> List[pygame.Surface]:
+    """点滅するテキストのフレーム列を生成（1周期を steps 分割）"""
+    text_surf = font.render(text, True, color)
+    frames = []
+    for i in range(steps):
+        frame = text_surf.copy()
+        frame.set_alpha(int(128 + 127 * math.sin(i / steps * math.pi * 2)))
+        frames.append(frame)
+    return frames
+
+
+def build_title_glow_frames(text: str, color: Tuple[int, int, int],
+                            steps: int = TITLE_GLOW_STEPS) -> List[pygame.Surface]:
+    """脈動するタイトルグローのフレーム列を生成（1周期を steps 分割）"""
+    title_surf = font_large.render(text, True, color)
+    frames = []
+    for step in range(steps):
+        pulse = 0.8 + math.sin(step / steps * math.pi * 2) * 0.2
+        glow_surf = pygame.Surface((title_surf.get_width() + 40, title_surf.get_height() + 40), pygame.SRCALPHA)
+        for i in range(10, 0, -1):
+            alpha = int((1 - i / 10) * 50 * pulse)
+            temp_surf = font_large.render(text, True, (*color[:3], alpha))
+            glow_surf.blit(temp_surf, (20 - i, 20 - i))
+            glow_surf.blit(temp_surf, (20 + i, 20 + i))
+        glow_surf.blit(title_surf, (20, 20))
+        frames.append(glow_surf)
+    return frames
+
+
 class ScreenShake:
     """スクリーンシェイク効果"""
     def __init__(self):
@@ -153,9 +369,10 @@ class Particle:
 
     def draw(self, surface: pygame.Surface, offset: Tuple[float, float] = (0, 0)):
         if self.life > 0:
+            scale = surface_scale(surface)
             ratio = self.life / self.initial_life
             alpha = int(255 * ratio)
-            size = int(self.size * ratio)
+            size = int(self.size * ratio * scale)
             if size > 0:
                 glow_surf = pygame.Surface((size * 6, size * 6), pygame.SRCALPHA)
                 # グロー
@@ -164,7 +381,8 @@ class Particle:
                     pygame.draw.circle(glow_surf, (*self.color, a), (size * 3, size * 3), i + size)
                 # コア
                 pygame.draw.circle(glow_surf, (*self.color, alpha), (size * 3, size * 3), size)
-                surface.blit(glow_surf, (self.x - size * 3 + offset[0], self.y - size * 3 + offset[1]))
+                surface.blit(glow_surf, ((self.x + offset[0]) * scale - size * 3,
+                                         (self.y + offset[1]) * scale - size * 3))
 
 
 class TrailParticle:
@@ -200,16 +418,26 @@ class Paddle:
         self.score = 0
         self.target_y = y
         self.hit_flash = 0
-
-    def move_up(self):
-        self.rect.y -= self.speed
+        self.move_remainder = 0.0
+
+    def move(self, amount: float):
+        """amount フレーム分移動（負で上、正で下）。1px 未満の端数は次回に持ち越す"""
+        self.move_remainder += self.speed * amount
+        step = int(self.move_remainder)
+        self.move_remainder -= step
+        self.rect.y += step
         if self.rect.top < 60:
             self.rect.top = 60
+            self.move_remainder = 0.0
+        elif self.rect.bottom > SCREEN_HEIGHT - 20:
+            self.rect.bottom = SCREEN_HEIGHT - 20
+            self.move_remainder = 0.0
+
+    def move_up(self):
+        self.move(-1)
 
     def move_down(self):
-        self.rect.y += self.speed
-        if self.rect.bottom > SCREEN_HEIGHT - 20:
-            self.rect.bottom = SCREEN_HEIGHT - 20
+        self.move(1)
 
     def flash(self):
         self.hit_flash = 10
@@ -344,13 +572,19 @@ class Ball:
 
 class ScorePopup:
     """スコア獲得時のポップアップ"""
-    def __init__(self, x: int, y: int, text: str, color: Tuple[int, int, int]):
+    def __init__(self, x: int, y: int, text: str, color: Tuple[int, int, int], life: int = POPUP_LIFE):
         self.x = x
         self.y = y
         self.text = text
         self.color = color
-        self.life = 60
-        self.initial_life = 60
+        self.life = life
+        self.initial_life = life
+        self.clip = ScorePopup.get_clip(text, color, life)
+
+    @staticmethod
+    def get_clip(text: str, color: Tuple[int, int, int], life: int = POPUP_LIFE) -> AnimationClip:
+        return AnimationClip.get(("popup", text, color, life),
+                                 lambda: build_popup_frames(text, color, life))
 
     def update(self):
         self.y -= 1.5
@@ -358,25 +592,122 @@ class ScorePopup:
 
     def draw(self, surface: pygame.Surface, offset: Tuple[float, float] = (0, 0)):
         if self.life > 0:
-            ratio = self.life / self.initial_life
-            alpha = int(255 * ratio)
-            scale = 1 + (1 - ratio) * 0.5
-
-            text_surf = font_medium.render(self.text, True, self.color)
-            text_surf.set_alpha(alpha)
-
-            scaled_size = (int(text_surf.get_width() * scale), int(text_surf.get_height() * scale))
-            scaled_surf = pygame.transform.scale(text_surf, scaled_size)
-
-            surface.blit(scaled_surf,
-                        (self.x - scaled_size[0] // 2 + offset[0],
-                         self.y - scaled_size[1] // 2 + offset[1]))
+            frame = self.clip.frame(self.initial_life - self.life)
+            surface.blit(frame,
+                        (self.x - frame.get_width() // 2 + offset[0],
+                         self.y - frame.get_height() // 2 + offset[1]))
+
+
+class InputTracker:
+    """KEYDOWN/KEYUP を到着時刻付きで記録し、サンプル間の押下時間を求める"""
+    def __init__(self, keys: Tuple[int, ...]):
+        self.keys = keys
+        self.down_since: Dict[int, float] = {}
+        self.held_time: Dict[int, float] = {key: 0.0 for key in keys}
+        self.sample_time = time.perf_counter()
+        self.pending_since: Optional[float] = None  # 未反映の入力で最も古い時刻
+
+    def key_down(self, key: int, timestamp: float):
+        if key in self.held_time and key not in self.down_since:
+            self.down_since[key] = timestamp
+            self._mark_pending(timestamp)
+
+    def key_up(self, key: int, timestamp: float):
+        start = self.down_since.pop(key, None)
+        if start is not None:
+            self.held_time[key] += max(0.0, timestamp - max(start, self.sample_time))
+            self._mark_pending(timestamp)
+
+    def _mark_pending(self, timestamp: float):
+        if self.pending_since is None:
+            self.pending_since = timestamp
+
+    def sample(self, now: float) -> Dict[int, float]:
+        """前回のサンプルから now までに各キーが押されていた割合（0〜1）"""
+        duration = now - self.sample_time
+        fractions = {}
+        for key in self.keys:
+            held = self.held_time[key]
+            if key in self.down_since:
+                held += now - max(self.down_since[key], self.sample_time)
+            if duration > 0:
+                fractions[key] = min(1.0, held / duration)
+            else:
+                fractions[key] = 1.0 if key in self.down_since else 0.0
+            self.held_time[key] = 0.0
+        self.sample_time = now
+        return fractions
+
+    def take_pending(self) -> Optional[float]:
+        """今回のサンプルで反映された入力の到着時刻を取り出す"""
+        pending, self.pending_since = self.pending_since, None
+        return pending
+
+
+class LatencyHistogram:
+    """入力から画面表示までの遅延をミリ秒単位のビンで集計"""
+    def __init__(self, bin_ms: float = 1.0, max_ms: float = 100.0):
+        self.bin_ms = bin_ms
+        self.bins = [0] * (int(max_ms / bin_ms) + 1)  # 最後のビンは max_ms 以上
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, seconds: float):
+        ms = seconds * 1000
+        self.bins[min(int(ms / self.bin_ms), len(self.bins) - 1)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def mean(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """p パーセンタイル（ビンの上端, ms）。上限なしの最終ビンや最大値を超える場合は最大値"""
+        if not self.count:
+            return 0.0
+        threshold = self.count * p / 100
+        cumulative = 0
+        for i, n in enumerate(self.bins[:-1]):
+            cumulative += n
+            if cumulative >= threshold:
+                return min((i + 1) * self.bin_ms, self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> str:
+        return (f"INPUT LAG  p50 {self.percentile(50):.0f}ms  p95 {self.percentile(95):.0f}ms  "
+                f"max {self.max_ms:.1f}ms")
+
+    def report(self) -> str:
+        lines = [f"input-to-present latency: n={self.count} mean={self.mean():.2f}ms "
+                 f"p50={self.percentile(50):.0f}ms p95={self.percentile(95):.0f}ms "
+                 f"p99={self.percentile(99):.0f}ms max={self.max_ms:.2f}ms"]
+        peak = max(self.bins) or 1
+        for i, n in enumerate(self.bins):
+            if n:
+                low = i * self.bin_ms
+                label = f">={low:.0f}" if i == len(self.bins) - 1 else f"{low:.0f}-{low + self.bin_ms:.0f}"
+                lines.append(f"  {label:>8}ms {n:6d} {'#' * max(1, n * 40 // peak)}")
+        return "\n".join(lines)
 
 
 class Game:
     """メインゲームクラス"""
-    def __init__(self):
-        self.clock = pygame.time.Clock()
+    TITLE_TEXT = "NEON TENNIS"
+    PULSE_PROMPTS = (
+        (font_medium, "PRESS SPACE TO START"),
+        (font_small, "Press SPACE to resume"),
+        (font_small, "Press R to restart"),
+    )
+
+    def __init__(self, renderer: Optional[Renderer] = None):
+        self.renderer = renderer or Renderer()
+        self.input = InputTracker((pygame.K_w, pygame.K_s, pygame.K_UP, pygame.K_DOWN))
+        self.latency = LatencyHistogram()
+        self.show_latency = False
+        self.event_queue: List[Tuple[float, pygame.event.Event]] = []
+        self.work_estimate = 0.0
         self.screen_shake = ScreenShake()
         self.player1 = Paddle(40, SCREEN_HEIGHT // 2 - PADDLE_HEIGHT // 2,
                              Colors.PLAYER1, Colors.PLAYER1_GLOW)
@@ -396,11 +727,33 @@ class Game:
         # 背景グリッド用
         self.grid_offset = 0
 
+        # 初回表示時のフレーム落ちを避けるため、アニメーションは事前に生成しておく
+        ScorePopup.get_clip("+1", Colors.PLAYER1)
+        ScorePopup.get_clip("+1", Colors.PLAYER2)
+        Game.get_title_glow_clip()
+        for font, text in Game.PULSE_PROMPTS:
+            Game.get_pulse_clip(font, text, Colors.WHITE)
+
+    @staticmethod
+    def get_pulse_clip(font: pygame.font.Font, text: str, color: Tuple[int, int, int]) -> AnimationClip:
+        return AnimationClip.get(("pulse", font, text, color),
+                                 lambda: build_pulse_frames(font, text, color))
+
+    @staticmethod
+    def get_title_glow_clip() -> AnimationClip:
+        return AnimationClip.get(("title_glow", Game.TITLE_TEXT, Colors.NEON_CYAN),
+                                 lambda: build_title_glow_frames(Game.TITLE_TEXT, Colors.NEON_CYAN))
+
     def reset(self):
+        self.screen_shake = ScreenShake()
         self.player1.score = 0
         self.player2.score = 0
+        self.player1.hit_flash = 0
+        self.player2.hit_flash = 0
         self.player1.rect.y = SCREEN_HEIGHT // 2 - PADDLE_HEIGHT // 2
         self.player2.rect.y = SCREEN_HEIGHT // 2 - PADDLE_HEIGHT // 2
+        self.player1.move_remainder = 0.0
+        self.player2.move_remainder = 0.0
         self.ball.reset()
         self.particles.clear()
         self.popups.clear()
@@ -409,6 +762,10 @@ class Game:
         self.rally_count = 0
         self.max_rally = 0
 
+    @property
+    def screen(self) -> pygame.Surface:
+        return self.renderer.target
+
     def spawn_hit_particles(self, x: float, y: float, color: Tuple[int, int, int], count: int = 15):
         for _ in range(count):
             self.particles.append(Particle(x, y, color))
@@ -429,54 +786,67 @@ class Game:
             velocity = (math.cos(angle) * speed, math.sin(angle) * speed)
             self.particles.append(Particle(x, y, color, velocity=velocity, size=3, life=25))
 
-    def draw_background(self):
+    def draw_pulse_text(self, font: pygame.font.Font, text: str, color: Tuple[int, int, int], y: int):
+        """点滅テキストを中央揃えで描画"""
+        frame = Game.get_pulse_clip(font, text, color).frame_at_phase(self.menu_pulse * 2)
+        self.screen.blit(frame, (SCREEN_WIDTH // 2 - frame.get_width() // 2, y))
+
+    def draw_background(self, surface: pygame.Surface):
+        scale = surface_scale(surface)
+        width, height = surface.get_size()
+
         # グラデーション背景
-        for y in range(SCREEN_HEIGHT):
-            ratio = y / SCREEN_HEIGHT
+        for y in range(height):
+            ratio = y / height
             color = tuple(int(Colors.BG_GRADIENT_TOP[i] +
                             (Colors.BG_GRADIENT_BOTTOM[i] - Colors.BG_GRADIENT_TOP[i]) * ratio)
                          for i in range(3))
-            pygame.draw.line(screen, color, (0, y), (SCREEN_WIDTH, y))
+            pygame.draw.line(surface, color, (0, y), (width, y))
 
         # アニメーショングリッド
         self.grid_offset = (self.grid_offset + 0.5) % 40
-        grid_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        grid_surf = pygame.Surface((width, height), pygame.SRCALPHA)
 
         for x in range(0, SCREEN_WIDTH + 40, 40):
             alpha = 15 + int(10 * math.sin((x + self.grid_offset) * 0.05))
-            pygame.draw.line(grid_surf, (100, 100, 150, alpha),
-                           (x - self.grid_offset, 0), (x - self.grid_offset, SCREEN_HEIGHT))
+            grid_x = (x - self.grid_offset) * scale
+            pygame.draw.line(grid_surf, (100, 100, 150, alpha), (grid_x, 0), (grid_x, height))
         for y in range(0, SCREEN_HEIGHT + 40, 40):
             alpha = 15 + int(10 * math.sin((y + self.grid_offset) * 0.05))
-            pygame.draw.line(grid_surf, (100, 100, 150, alpha),
-                           (0, y - self.grid_offset), (SCREEN_WIDTH, y - self.grid_offset))
-        screen.blit(grid_surf, (0, 0))
+            grid_y = (y - self.grid_offset) * scale
+            pygame.draw.line(grid_surf, (100, 100, 150, alpha), (0, grid_y), (width, grid_y))
+        surface.blit(grid_surf, (0, 0))
 
-    def draw_court(self, offset: Tuple[float, float] = (0, 0)):
+    def draw_court(self, surface: pygame.Surface, offset: Tuple[float, float] = (0, 0)):
+        scale = surface_scale(surface)
         ox, oy = offset
+        left, right = 20 * scale, (SCREEN_WIDTH - 20) * scale
+        top, bottom = 60 * scale, (SCREEN_HEIGHT - 20) * scale
+        line_width = max(1, int(2 * scale))
 
         # コート境界線（ネオン）
-        border_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        border_surf = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
 
         # 上下の境界
         for i in range(8, 0, -1):
             alpha = int((1 - i / 8) * 60)
             pygame.draw.line(border_surf, (*Colors.NEON_PURPLE, alpha),
-                           (20, 60 - i), (SCREEN_WIDTH - 20, 60 - i), 2)
+                           (left, top - i * scale), (right, top - i * scale), line_width)
             pygame.draw.line(border_surf, (*Colors.NEON_PURPLE, alpha),
-                           (20, SCREEN_HEIGHT - 20 + i), (SCREEN_WIDTH - 20, SCREEN_HEIGHT - 20 + i), 2)
+                           (left, bottom + i * scale), (right, bottom + i * scale), line_width)
 
-        pygame.draw.line(border_surf, Colors.NEON_PURPLE, (20, 60), (SCREEN_WIDTH - 20, 60), 2)
-        pygame.draw.line(border_surf, Colors.NEON_PURPLE, (20, SCREEN_HEIGHT - 20),
-                        (SCREEN_WIDTH - 20, SCREEN_HEIGHT - 20), 2)
+        pygame.draw.line(border_surf, Colors.NEON_PURPLE, (left, top), (right, top), line_width)
+        pygame.draw.line(border_surf, Colors.NEON_PURPLE, (left, bottom), (right, bottom), line_width)
 
-        screen.blit(border_surf, (ox, oy))
+        surface.blit(border_surf, (ox * scale, oy * scale))
 
         # センターライン（点線）
+        dash_w, dash_h = max(1, int(4 * scale)), max(1, int(12 * scale))
         for y in range(70, SCREEN_HEIGHT - 30, 25):
-            line_surf = pygame.Surface((4, 12), pygame.SRCALPHA)
-            pygame.draw.rect(line_surf, (*Colors.GRAY, 100), (0, 0, 4, 12), border_radius=2)
-            screen.blit(line_surf, (SCREEN_WIDTH // 2 - 2 + ox, y + oy))
+            line_surf = pygame.Surface((dash_w, dash_h), pygame.SRCALPHA)
+            pygame.draw.rect(line_surf, (*Colors.GRAY, 100), (0, 0, dash_w, dash_h),
+                             border_radius=max(1, int(2 * scale)))
+            surface.blit(line_surf, ((SCREEN_WIDTH // 2 - 2 + ox) * scale, (y + oy) * scale))
 
     def draw_hud(self, offset: Tuple[float, float] = (0, 0)):
         ox, oy = offset
@@ -484,63 +854,54 @@ class Game:
         # スコアボード背景
         header_surf = pygame.Surface((SCREEN_WIDTH, 55), pygame.SRCALPHA)
         pygame.draw.rect(header_surf, (0, 0, 0, 180), (0, 0, SCREEN_WIDTH, 55))
-        screen.blit(header_surf, (ox, oy))
+        self.screen.blit(header_surf, (ox, oy))
 
         # プレイヤー1スコア
         score1_text = font_medium.render(str(self.player1.score), True, Colors.PLAYER1)
         glow1 = font_medium.render(str(self.player1.score), True, Colors.PLAYER1_GLOW)
-        screen.blit(glow1, (102 + ox, 7 + oy))
-        screen.blit(score1_text, (100 + ox, 5 + oy))
+        self.screen.blit(glow1, (102 + ox, 7 + oy))
+        self.screen.blit(score1_text, (100 + ox, 5 + oy))
 
         label1 = font_tiny.render("PLAYER 1", True, Colors.GRAY)
-        screen.blit(label1, (100 + ox, 35 + oy))
+        self.screen.blit(label1, (100 + ox, 35 + oy))
 
         # プレイヤー2スコア
         score2_text = font_medium.render(str(self.player2.score), True, Colors.PLAYER2)
         glow2 = font_medium.render(str(self.player2.score), True, Colors.PLAYER2_GLOW)
-        screen.blit(glow2, (SCREEN_WIDTH - 132 + ox, 7 + oy))
-        screen.blit(score2_text, (SCREEN_WIDTH - 130 + ox, 5 + oy))
+        self.screen.blit(glow2, (SCREEN_WIDTH - 132 + ox, 7 + oy))
+        self.screen.blit(score2_text, (SCREEN_WIDTH - 130 + ox, 5 + oy))
 
         label2 = font_tiny.render("PLAYER 2", True, Colors.GRAY)
-        screen.blit(label2, (SCREEN_WIDTH - 130 + ox, 35 + oy))
+        self.screen.blit(label2, (SCREEN_WIDTH - 130 + ox, 35 + oy))
 
         # 中央: ラリーカウント
         if self.rally_count > 0:
             rally_color = Colors.NEON_YELLOW if self.rally_count >= 5 else Colors.GRAY
             rally_text = font_small.render(f"RALLY {self.rally_count}", True, rally_color)
-            screen.blit(rally_text, (SCREEN_WIDTH // 2 - rally_text.get_width() // 2 + ox, 15 + oy))
+            self.screen.blit(rally_text, (SCREEN_WIDTH // 2 - rally_text.get_width() // 2 + ox, 15 + oy))
+
+        # 入力遅延（F3）
+        if self.show_latency:
+            latency_text = font_tiny.render(self.latency.summary(), True, Colors.GRAY)
+            self.screen.blit(latency_text, (SCREEN_WIDTH // 2 - latency_text.get_width() // 2, SCREEN_HEIGHT - 17))
 
     def draw_menu(self):
-        self.draw_background()
+        self.draw_background(self.renderer.effects)
+        self.renderer.compose_effects()
 
         self.menu_pulse = (self.menu_pulse + 0.05) % (math.pi * 2)
-        pulse = 0.8 + math.sin(self.menu_pulse) * 0.2
 
         # タイトル
-        title_text = "NEON TENNIS"
-        title_surf = font_large.render(title_text, True, Colors.NEON_CYAN)
-
-        # タイトルグロー
-        glow_surf = pygame.Surface((title_surf.get_width() + 40, title_surf.get_height() + 40), pygame.SRCALPHA)
-        glow_text = font_large.render(title_text, True, Colors.NEON_CYAN)
-        for i in range(10, 0, -1):
-            alpha = int((1 - i / 10) * 50 * pulse)
-            temp_surf = font_large.render(title_text, True, (*Colors.NEON_CYAN[:3], alpha))
-            glow_surf.blit(temp_surf, (20 - i, 20 - i))
-            glow_surf.blit(temp_surf, (20 + i, 20 + i))
-        glow_surf.blit(title_surf, (20, 20))
+        glow_surf = Game.get_title_glow_clip().frame_at_phase(self.menu_pulse)
 
-        screen.blit(glow_surf, (SCREEN_WIDTH // 2 - glow_surf.get_width() // 2, 150))
+        self.screen.blit(glow_surf, (SCREEN_WIDTH // 2 - glow_surf.get_width() // 2, 150))
 
         # サブタイトル
         subtitle = font_small.render("MODERN EDITION", True, Colors.NEON_PINK)
-        screen.blit(subtitle, (SCREEN_WIDTH // 2 - subtitle.get_width() // 2, 240))
+        self.screen.blit(subtitle, (SCREEN_WIDTH // 2 - subtitle.get_width() // 2, 240))
 
         # スタート指示
-        alpha = int(128 + 127 * math.sin(self.menu_pulse * 2))
-        start_text = font_medium.render("PRESS SPACE TO START", True, Colors.WHITE)
-        start_text.set_alpha(alpha)
-        screen.blit(start_text, (SCREEN_WIDTH // 2 - start_text.get_width() // 2, 350))
+        self.draw_pulse_text(font_medium, "PRESS SPACE TO START", Colors.WHITE, 350)
 
         # 操作説明
         controls = [
@@ -554,35 +915,32 @@ class Game:
             keys_surf = font_small.render(keys, True, Colors.WHITE)
             total_width = label_surf.get_width() + 20 + keys_surf.get_width()
             x_start = SCREEN_WIDTH // 2 - total_width // 2
-            screen.blit(label_surf, (x_start, y_offset + 5))
-            screen.blit(keys_surf, (x_start + label_surf.get_width() + 20, y_offset))
+            self.screen.blit(label_surf, (x_start, y_offset + 5))
+            self.screen.blit(keys_surf, (x_start + label_surf.get_width() + 20, y_offset))
             y_offset += 40
 
         # フッター
         footer = font_tiny.render("First to 11 wins  |  SPACE: Pause  |  R: Restart", True, Colors.GRAY)
-        screen.blit(footer, (SCREEN_WIDTH // 2 - footer.get_width() // 2, SCREEN_HEIGHT - 40))
+        self.screen.blit(footer, (SCREEN_WIDTH // 2 - footer.get_width() // 2, SCREEN_HEIGHT - 40))
 
     def draw_pause_overlay(self, offset: Tuple[float, float] = (0, 0)):
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 180))
-        screen.blit(overlay, (0, 0))
+        self.screen.blit(overlay, (0, 0))
 
         self.menu_pulse = (self.menu_pulse + 0.05) % (math.pi * 2)
 
         # PAUSED テキスト
         pause_text = font_large.render("PAUSED", True, Colors.NEON_CYAN)
-        screen.blit(pause_text, (SCREEN_WIDTH // 2 - pause_text.get_width() // 2, SCREEN_HEIGHT // 2 - 60))
+        self.screen.blit(pause_text, (SCREEN_WIDTH // 2 - pause_text.get_width() // 2, SCREEN_HEIGHT // 2 - 60))
 
         # 再開指示
-        alpha = int(128 + 127 * math.sin(self.menu_pulse * 2))
-        resume_text = font_small.render("Press SPACE to resume", True, Colors.WHITE)
-        resume_text.set_alpha(alpha)
-        screen.blit(resume_text, (SCREEN_WIDTH // 2 - resume_text.get_width() // 2, SCREEN_HEIGHT // 2 + 20))
+        self.draw_pulse_text(font_small, "Press SPACE to resume", Colors.WHITE, SCREEN_HEIGHT // 2 + 20)
 
     def draw_game_over(self, offset: Tuple[float, float] = (0, 0)):
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 200))
-        screen.blit(overlay, (0, 0))
+        self.screen.blit(overlay, (0, 0))
 
         self.menu_pulse = (self.menu_pulse + 0.05) % (math.pi * 2)
 
@@ -590,34 +948,185 @@ class Game:
 
         # WINNER テキスト
         winner_text = font_large.render(f"PLAYER {self.winner} WINS!", True, winner_color)
-        screen.blit(winner_text, (SCREEN_WIDTH // 2 - winner_text.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
+        self.screen.blit(winner_text, (SCREEN_WIDTH // 2 - winner_text.get_width() // 2, SCREEN_HEIGHT // 2 - 100))
 
         # 最終スコア
         score_text = font_medium.render(f"{self.player1.score}  -  {self.player2.score}", True, Colors.WHITE)
-        screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, SCREEN_HEIGHT // 2 - 20))
+        self.screen.blit(score_text, (SCREEN_WIDTH // 2 - score_text.get_width() // 2, SCREEN_HEIGHT // 2 - 20))
 
         # 最大ラリー
         if self.max_rally > 0:
             rally_text = font_small.render(f"Max Rally: {self.max_rally}", True, Colors.NEON_YELLOW)
-            screen.blit(rally_text, (SCREEN_WIDTH // 2 - rally_text.get_width() // 2, SCREEN_HEIGHT // 2 + 40))
+            self.screen.blit(rally_text, (SCREEN_WIDTH // 2 - rally_text.get_width() // 2, SCREEN_HEIGHT // 2 + 40))
 
         # リスタート指示
-        alpha = int(128 + 127 * math.sin(self.menu_pulse * 2))
-        restart_text = font_small.render("Press R to restart", True, Colors.WHITE)
-        restart_text.set_alpha(alpha)
-        screen.blit(restart_text, (SCREEN_WIDTH // 2 - restart_text.get_width() // 2, SCREEN_HEIGHT // 2 + 100))
-
-    def handle_input(self):
-        keys = pygame.key.get_pressed()
-
-        if keys[pygame.K_w]:
-            self.player1.move_up()
-        if keys[pygame.K_s]:
-            self.player1.move_down()
-        if keys[pygame.K_UP]:
-            self.player2.move_up()
-        if keys[pygame.K_DOWN]:
-            self.player2.move_down()
+        self.draw_pulse_text(font_small, "Press R to restart", Colors.WHITE, SCREEN_HEIGHT // 2 + 100)
+
+    def snapshot(self, include_effects: bool = False) -> bytes:
+        """ゲーム状態をバイナリにシリアライズ（include_effects でパーティクル等も含める）"""
+        ball, p1, p2, shake = self.ball, self.player1, self.player2, self.screen_shake
+        _, rng_words, gauss_next = random.getstate()
+        parts = [
+            SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, SNAPSHOT_EFFECTS if include_effects else 0),
+            SNAPSHOT_STATE.pack(
+                GAME_STATES.index(self.state), self.paused, self.game_over, self.winner or 0,
+                self.rally_count, self.max_rally, self.menu_pulse, self.grid_offset,
+                ball.x, ball.y, ball.dx, ball.dy, ball.speed, ball.pulse, *ball.color,
+                p1.rect.x, p1.rect.y, p1.score, p1.hit_flash, p1.move_remainder,
+                p2.rect.x, p2.rect.y, p2.score, p2.hit_flash, p2.move_remainder,
+                shake.trauma, shake.offset_x, shake.offset_y),
+            SNAPSHOT_RNG.pack(*rng_words, gauss_next is not None, gauss_next or 0.0),
+        ]
+        if include_effects:
+            parts.append(SNAPSHOT_COUNTS.pack(len(ball.trail_particles), len(self.particles), len(self.popups)))
+            for t in ball.trail_particles:
+                parts.append(SNAPSHOT_TRAIL.pack(t.x, t.y, t.life, t.initial_life, *t.color))
+            for p in self.particles:
+                parts.append(SNAPSHOT_PARTICLE.pack(p.x, p.y, p.dx, p.dy, p.size, *p.color,
+                                                    p.life, p.initial_life))
+            for p in self.popups:
+                text = p.text.encode()
+                parts.append(SNAPSHOT_POPUP.pack(p.x, p.y, *p.color, p.life, p.initial_life, len(text)))
+                parts.append(text)
+        return b"".join(parts)
+
+    def restore(self, data: bytes):
+        """snapshot() で保存した状態を復元（エフェクトを含まない場合は消去する）
+
+        全体を検証・展開してから反映するので、不正なデータではゲームは変更されない。
+        """
+        offset = 0
+
+        def unpack(record: struct.Struct) -> tuple:
+            nonlocal offset
+            if offset + record.size > len(data):
+                raise ValueError("truncated game snapshot")
+            values = record.unpack_from(data, offset)
+            offset += record.size
+            return values
+
+        magic, version, flags = unpack(SNAPSHOT_HEADER)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("not a game snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"unsupported snapshot version: {version}")
+
+        (state, paused, game_over, winner,
+         rally_count, max_rally, menu_pulse, grid_offset,
+         ball_x, ball_y, ball_dx, ball_dy, ball_speed, ball_pulse, r, g, b,
+         p1_x, p1_y, p1_score, p1_hit_flash, p1_remainder,
+         p2_x, p2_y, p2_score, p2_hit_flash, p2_remainder,
+         trauma, shake_x, shake_y) = unpack(SNAPSHOT_STATE)
+        if state >= len(GAME_STATES):
+            raise ValueError(f"invalid game state in snapshot: {state}")
+        ball_color = (r, g, b)
+        rng = unpack(SNAPSHOT_RNG)
+        rng_state = (3, rng[:625], rng[626] if rng[625] else None)
+
+        trails: List[TrailParticle] = []
+        particles: List[Particle] = []
+        popups: List[ScorePopup] = []
+        if flags & SNAPSHOT_EFFECTS:
+            trail_count, particle_count, popup_count = unpack(SNAPSHOT_COUNTS)
+            for _ in range(trail_count):
+                x, y, life, initial_life, r, g, b = unpack(SNAPSHOT_TRAIL)
+                trail = TrailParticle(x, y, (r, g, b))
+                trail.life, trail.initial_life = life, initial_life
+                trails.append(trail)
+            for _ in range(particle_count):
+                x, y, dx, dy, size, r, g, b, life, initial_life = unpack(SNAPSHOT_PARTICLE)
+                particle = Particle(x, y, (r, g, b), velocity=(dx, dy), size=size, life=initial_life)
+                particle.life = life
+                particles.append(particle)
+            for _ in range(popup_count):
+                x, y, r, g, b, life, initial_life, length = unpack(SNAPSHOT_POPUP)
+                if offset + length > len(data):
+                    raise ValueError("truncated game snapshot")
+                text = bytes(data[offset:offset + length]).decode()
+                offset += length
+                popup = ScorePopup(x, y, text, (r, g, b), life=initial_life)
+                popup.life = life
+                popups.append(popup)
+        if offset != len(data):
+            raise ValueError("trailing data after game snapshot")
+
+        # ここから反映（random.setstate は不正な状態で失敗しうるので最初に行う）
+        random.setstate(rng_state)
+        ball, p1, p2, shake = self.ball, self.player1, self.player2, self.screen_shake
+        self.state = GAME_STATES[state]
+        self.paused = bool(paused)
+        self.game_over = bool(game_over)
+        self.winner = winner or None
+        self.rally_count, self.max_rally = rally_count, max_rally
+        self.menu_pulse, self.grid_offset = menu_pulse, grid_offset
+        ball.x, ball.y, ball.dx, ball.dy = ball_x, ball_y, ball_dx, ball_dy
+        ball.speed, ball.pulse, ball.color = ball_speed, ball_pulse, ball_color
+        p1.rect.x, p1.rect.y, p1.score, p1.hit_flash, p1.move_remainder = (
+            p1_x, p1_y, p1_score, p1_hit_flash, p1_remainder)
+        p2.rect.x, p2.rect.y, p2.score, p2.hit_flash, p2.move_remainder = (
+            p2_x, p2_y, p2_score, p2_hit_flash, p2_remainder)
+        shake.trauma, shake.offset_x, shake.offset_y = trauma, shake_x, shake_y
+        ball.trail_particles = trails
+        self.particles = particles
+        self.popups = popups
+
+    def poll_events(self):
+        """イベントキューを取り出し、到着時刻を付けて保持"""
+        now = time.perf_counter()
+        for event in pygame.event.get():
+            self.event_queue.append((now, event))
+
+    def wait_until(self, deadline: float):
+        """deadline まで待機しつつイベントを細かくポーリングする"""
+        while True:
+            self.poll_events()
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            time.sleep(min(remaining, INPUT_POLL_INTERVAL))
+
+    def handle_events(self) -> bool:
+        """保持しているイベントを処理。終了要求があれば False を返す"""
+        running = True
+        for timestamp, event in self.event_queue:
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.VIDEORESIZE:
+                self.renderer.resize(event.size)
+            elif event.type == pygame.KEYUP:
+                self.input.key_up(event.key, timestamp)
+            elif event.type == pygame.KEYDOWN:
+                self.input.key_down(event.key, timestamp)
+                if event.key == pygame.K_ESCAPE:
+                    if self.state == "playing":
+                        self.state = "menu"
+                        self.reset()
+                    else:
+                        running = False
+                elif event.key == pygame.K_SPACE:
+                    if self.state == "menu":
+                        self.state = "playing"
+                        self.reset()
+                    elif not self.game_over:
+                        self.paused = not self.paused
+                elif event.key == pygame.K_r:
+                    if self.state == "playing":
+                        self.reset()
+                elif event.key == pygame.K_F3:
+                    self.show_latency = not self.show_latency
+                elif event.key == pygame.K_F11:
+                    self.renderer.toggle_fullscreen()
+        self.event_queue.clear()
+        return running
+
+    def handle_input(self, now: float):
+        # 押されていた時間の割合だけ移動させる（フレーム途中の押下・離しを反映）
+        held = self.input.sample(now)
+        if self.state != "playing":
+            return
+
+        self.player1.move(held[pygame.K_s] - held[pygame.K_w])
+        self.player2.move(held[pygame.K_DOWN] - held[pygame.K_UP])
 
     def update(self):
         if self.state == "menu":
@@ -692,21 +1201,22 @@ class Game:
 
         offset = self.screen_shake.get_offset()
 
-        self.draw_background()
-        self.draw_court(offset)
-
-        # パーティクル
+        # エフェクト層（背景・コート・パーティクル）
+        effects = self.renderer.effects
+        self.draw_background(effects)
+        self.draw_court(effects, offset)
         for p in self.particles:
-            p.draw(screen, offset)
+            p.draw(effects, offset)
+        self.renderer.compose_effects()
 
         # ゲームオブジェクト
-        self.player1.draw(screen, offset)
-        self.player2.draw(screen, offset)
-        self.ball.draw(screen, offset)
+        self.player1.draw(self.screen, offset)
+        self.player2.draw(self.screen, offset)
+        self.ball.draw(self.screen, offset)
 
         # ポップアップ
         for p in self.popups:
-            p.draw(screen, offset)
+            p.draw(self.screen, offset)
 
         self.draw_hud(offset)
 
@@ -717,36 +1227,36 @@ class Game:
 
     def run(self):
         running = True
+        frame_time = 1.0 / FPS
+        deadline = time.perf_counter()
 
         while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        if self.state == "playing":
-                            self.state = "menu"
-                            self.reset()
-                        else:
-                            running = False
-                    elif event.key == pygame.K_SPACE:
-                        if self.state == "menu":
-                            self.state = "playing"
-                            self.reset()
-                        elif not self.game_over:
-                            self.paused = not self.paused
-                    elif event.key == pygame.K_r:
-                        if self.state == "playing":
-                            self.reset()
-
-            if self.state == "playing":
-                self.handle_input()
+            if LATE_INPUT_SAMPLING:
+                # 描画に必要な時間だけ残して待機し、表示直前の入力を拾う
+                self.wait_until(deadline - self.work_estimate - INPUT_SAMPLE_MARGIN)
+            else:
+                self.poll_events()
+
+            sample_time = time.perf_counter()
+            running = self.handle_events()
+            self.handle_input(sample_time)
+            input_time = self.input.take_pending()
             self.update()
             self.draw()
 
-            pygame.display.flip()
-            self.clock.tick(FPS)
+            self.renderer.present()
+            present_time = time.perf_counter()
+
+            if input_time is not None:
+                self.latency.add(present_time - input_time)
+            self.work_estimate = max(self.work_estimate * 0.95, present_time - sample_time)
+
+            deadline = max(deadline + frame_time, present_time)
+            if not LATE_INPUT_SAMPLING:
+                self.wait_until(deadline)
 
+        if self.latency.count and (LATENCY_REPORT or self.show_latency):
+            print(self.latency.report())
         pygame.quit()
         sys.exit()
 
@@ -0,0 +1,164 @@
+"""
+テニスゲーム - 強化学習用環境
+Gym 形式の reset/step API（gym 本体には依存しない）
+
+使い方:
+  env = TennisEnv(frame_skip=4)
+  obs, info = env.reset(seed=0)
+  obs, reward, terminated, truncated, info = env.step(ACTION_UP)
+
+観測ベクトル・info・描画フレームは毎ステップ同じバッファを再利用する。
+ステップをまたいで保持する場合はコピーすること。
+ウィンドウを開かずに実行するには環境変数 SDL_VIDEODRIVER=dummy を設定する。
+"""
+
+import random
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from tennis import Game, Renderer, SCREEN_WIDTH, SCREEN_HEIGHT, BALL_SPEED_MAX, WINNING_SCORE
+
+# 行動
+ACTION_STAY = 0
+ACTION_UP = 1
+ACTION_DOWN = 2
+ACTION_DIRECTIONS = (0, -1, 1)
+
+# 観測ベクトルのレイアウト（座標は画面サイズ、速度は最高速度、スコアは勝利点、
+# ラリー数は RALLY_CAP で正規化し 1 で頭打ち）
+RALLY_CAP = 20
+OBS_BALL_X = 0
+OBS_BALL_Y = 1
+OBS_BALL_DX = 2
+OBS_BALL_DY = 3
+OBS_BALL_SPEED = 4
+OBS_PLAYER1_Y = 5
+OBS_PLAYER2_Y = 6
+OBS_PLAYER1_SCORE = 7
+OBS_PLAYER2_SCORE = 8
+OBS_RALLY = 9
+OBS_SIZE = 10
+
+
+def tracking_opponent(game: Game) -> int:
+    """ボールの高さを追いかける簡易 AI（プレイヤー2用）"""
+    center = game.player2.rect.centery
+    if game.ball.y < center - 10:
+        return ACTION_UP
+    if game.ball.y > center + 10:
+        return ACTION_DOWN
+    return ACTION_STAY
+
+
+class TennisEnv:
+    """プレイヤー1を操作する Gym 形式の環境
+
+    render_mode:
+      None        描画しない（最速）
+      "rgb_array" 毎ステップ描画し、render() で画面のピクセルビュー (高さ, 幅, 3) を返す
+      "human"     毎ステップ描画してウィンドウに表示する
+    """
+    action_count = 3
+    observation_shape = (OBS_SIZE,)
+
+    def __init__(self, frame_skip: int = 1, render_mode: Optional[str] = None,
+                 opponent: Optional[Callable[[Game], int]] = tracking_opponent,
+                 max_steps: Optional[int] = None, game: Optional[Game] = None):
+        if render_mode not in (None, "rgb_array", "human"):
+            raise ValueError(f"unsupported render_mode: {render_mode}")
+        # human 以外ではディスプレイに触れず、環境ごとの専用サーフェスに描画する
+        self.game = game or Game(renderer=Renderer(offscreen=render_mode != "human"))
+        self.frame_skip = max(1, frame_skip)
+        self.render_mode = render_mode
+        self.opponent = opponent
+        self.max_steps = max_steps
+        self.steps = 0
+        self.observation = np.zeros(OBS_SIZE, dtype=np.float32)
+        self.frame: Optional[np.ndarray] = None
+        self.info: Dict[str, int] = {}
+
+    def reset(self, seed: Optional[int] = None) -> Tuple[np.ndarray, Dict[str, int]]:
+        self._release_frame()
+        if seed is not None:
+            random.seed(seed)
+        self.game.state = "playing"
+        self.game.paused = False
+        self.game.reset()
+        self.steps = 0
+        self._draw()
+        return self._observe(), self._update_info()
+
+    def step(self, action: int) -> Tuple[np.ndarray, float, bool, bool, Dict[str, int]]:
+        if not 0 <= action < self.action_count:
+            raise ValueError(f"invalid action: {action}")
+        self._release_frame()
+        game = self.game
+        direction = ACTION_DIRECTIONS[action]
+        reward = 0.0
+
+        for _ in range(self.frame_skip):
+            score1, score2 = game.player1.score, game.player2.score
+            game.player1.move(direction)
+            if self.opponent is not None:
+                game.player2.move(ACTION_DIRECTIONS[self.opponent(game)])
+            game.update()
+            reward += (game.player1.score - score1) - (game.player2.score - score2)
+            if game.game_over:
+                break
+
+        self.steps += 1
+        terminated = game.game_over
+        truncated = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+        self._draw()
+        return self._observe(), reward, terminated, truncated, self._update_info()
+
+    def render(self) -> Optional[np.ndarray]:
+        """直近のフレーム（rgb_array 時のみ）。次の step までに使い終えること"""
+        return self.frame
+
+    def close(self):
+        self.frame = None
+
+    def _release_frame(self):
+        """前回のピクセルビューを解放する。状態を変える前に呼び、失敗しても再試行できるようにする"""
+        # ピクセルビューはサーフェスをロックするので、描画前に解放が必要
+        self.frame = None
+        if self.render_mode is not None and self.game.screen.get_locked():
+            raise RuntimeError("a frame returned by render() is still referenced; copy it before the next step")
+
+    def _draw(self):
+        if self.render_mode is None:
+            return
+        self.game.draw()
+        if self.render_mode == "rgb_array":
+            self.frame = pygame.surfarray.pixels3d(self.game.screen).transpose(1, 0, 2)
+        else:
+            self.game.renderer.present()
+            # ウィンドウが応答なしにならないよう、イベントキューを処理させる
+            pygame.event.pump()
+
+    def _observe(self) -> np.ndarray:
+        game = self.game
+        ball = game.ball
+        obs = self.observation
+        obs[OBS_BALL_X] = ball.x / SCREEN_WIDTH
+        obs[OBS_BALL_Y] = ball.y / SCREEN_HEIGHT
+        obs[OBS_BALL_DX] = ball.dx / BALL_SPEED_MAX
+        obs[OBS_BALL_DY] = ball.dy / BALL_SPEED_MAX
+        obs[OBS_BALL_SPEED] = ball.speed / BALL_SPEED_MAX
+        obs[OBS_PLAYER1_Y] = game.player1.rect.centery / SCREEN_HEIGHT
+        obs[OBS_PLAYER2_Y] = game.player2.rect.centery / SCREEN_HEIGHT
+        obs[OBS_PLAYER1_SCORE] = game.player1.score / WINNING_SCORE
+        obs[OBS_PLAYER2_SCORE] = game.player2.score / WINNING_SCORE
+        obs[OBS_RALLY] = min(game.rally_count, RALLY_CAP) / RALLY_CAP
+        return obs
+
+    def _update_info(self) -> Dict[str, int]:
+        info = self.info
+        info["player1_score"] = self.game.player1.score
+        info["player2_score"] = self.game.player2.score
+        info["rally_count"] = self.game.rally_count
+        info["steps"] = self.steps
+        return info